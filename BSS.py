@@ -1,75 +1,192 @@
+import collections
+import functools
+import queue
+import threading
+import traceback
 import numpy as np
-import time
 import tkinter as tk
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import matplotlib.animation as animation
 
+# Small clocks are also packed into one integer, one byte lane per process.
+# Lanes stay <= 127 so the high bit of each lane is free to catch borrows.
+SWAR_MAX_PROCESSES = 8
+SWAR_LANE_LIMIT = 0x7F
+
+LINE_POOL_SIZE = 4  # Message path artists created up front for reuse
+GUI_POLL_MS = 16  # How often the Tk thread drains events posted by the worker
+
+def pack_clock(clock):
+    """Pack a small vector clock into an integer with one byte per entry."""
+    return int.from_bytes(clock.astype(np.uint8).tobytes(), "little")
+
+def vector_deliverable(vector_clock, timestamp, sender, n):
+    """BSS causal check over two 1-D clocks, compiled by compiled_vector_deliverable."""
+    if vector_clock[sender] != timestamp[sender] - 1:
+        return False
+    for i in range(n):
+        if i != sender and vector_clock[i] < timestamp[i]:
+            return False
+    return True
+
+@functools.lru_cache(maxsize=None)
+def compiled_vector_deliverable():
+    """Numba-compiled vector_deliverable, or None without Numba. Numba is imported on first call."""
+    try:
+        from numba import njit
+    except ImportError:  # Numba is optional
+        return None
+    return njit(cache=True)(vector_deliverable)
+
+# Straight-line causal checks for the three-process demo, one per sender
+def deliverable_from_p0(vc, ts):
+    return vc[0] == ts[0] - 1 and vc[1] >= ts[1] and vc[2] >= ts[2]
+
+def deliverable_from_p1(vc, ts):
+    return vc[1] == ts[1] - 1 and vc[0] >= ts[0] and vc[2] >= ts[2]
+
+def deliverable_from_p2(vc, ts):
+    return vc[2] == ts[2] - 1 and vc[0] >= ts[0] and vc[1] >= ts[1]
+
+DELIVERABLE_N3 = (deliverable_from_p0, deliverable_from_p1, deliverable_from_p2)
+
+class Message:
+    __slots__ = ("sender", "timestamp", "packed")  # Fixed fields, no per-message dict
+
+    def __init__(self, sender, timestamp, packed):
+        self.sender = sender
+        self.timestamp = timestamp  # Read-only copy of sender's vector clock
+        self.packed = packed  # Byte-lane packed timestamp, or None if the sender's clock is too large
+
 class ProcessBSS:
     def __init__(self, id, num_processes, gui):
         """Initialize process with vector clock and buffer."""
         self.id = id
         self.num_processes = num_processes
         self.vector_clock = np.zeros(num_processes, dtype=int)  # Vector clock for this process
-        self.buffer = []  # Buffer for out-of-order messages
+        self.buffer = [collections.deque() for _ in range(num_processes)]  # Out-of-order messages, one bucket per sender
+        self.buffered = 0  # Total number of messages across all buckets
+        # Per-sender "every entry but the sender" masks, and result buffers whose sender entry stays True
+        self.not_sender_masks = [np.arange(num_processes) != s for s in range(num_processes)]
+        self.ge_scratch = [np.ones(num_processes, dtype=bool) for _ in range(num_processes)]
         self.gui = gui  # Reference to GUI for updates
 
+        # Three processes get the unrolled checks; other small clocks use the packed copy
+        self.unrolled_checks = DELIVERABLE_N3 if num_processes == 3 else None
+        self.use_swar = self.unrolled_checks is None and num_processes <= SWAR_MAX_PROCESSES
+        self.clock_u64 = 0
+        self.lane_high_bits = [0x80 << (8 * i) for i in range(num_processes)]
+        self.all_high_bits = sum(self.lane_high_bits)
+
+        # Clocks too large to pack use the Numba kernel when installed; smaller ones never import it
+        self.compiled_check = compiled_vector_deliverable() if num_processes > SWAR_MAX_PROCESSES else None
+
     def increment_clock(self):
         """Increment local clock before an event."""
         self.vector_clock[self.id] += 1
+        if self.use_swar:
+            if self.vector_clock[self.id] > SWAR_LANE_LIMIT:
+                self.use_swar = False  # Counter outgrew its lane, use the array path from now on
+            else:
+                self.clock_u64 += 1 << (8 * self.id)
 
     def send_message(self, receiver, processes):
         """Send a message with a timestamp."""
         self.increment_clock()  # Update clock before sending
-        timestamp = self.vector_clock.copy()
+        # Immutable snapshot: one memcpy into bytes, viewed read-only by receivers
+        timestamp = np.frombuffer(self.vector_clock.tobytes(), dtype=self.vector_clock.dtype)
 
-        message = {"sender": self.id, "timestamp": timestamp}
+        packed = self.clock_u64 if self.use_swar else None
+        message = Message(self.id, timestamp, packed)
         self.gui.update_log(f"Process {self.id} SENT message to Process {receiver} with timestamp {timestamp}")
 
-        # Simulating network delay
-        time.sleep(1)
+        # Simulating network delay without blocking the GUI event loop
+        self.gui.schedule(1000, self.transmit_message, receiver, processes, message)
 
-        # Deliver message to the receiver process
+    def transmit_message(self, receiver, processes, message):
+        """Hand a sent message to the receiver once the network delay has elapsed."""
         processes[receiver].receive_message(message)
         self.gui.animate_message(self.id, receiver)  # Animate message flow
 
+    def can_deliver(self, sender, timestamp, packed=None):
+        """Check whether a message from sender with this timestamp is causally deliverable."""
+        if self.unrolled_checks is not None:
+            return self.unrolled_checks[sender](self.vector_clock, timestamp)
+
+        if packed is not None and self.use_swar:
+            # Each lane computes (local | 0x80) - timestamp; its high bit survives iff local >= timestamp
+            ge = ((self.clock_u64 | self.all_high_bits) - packed) & self.all_high_bits
+            shift = 8 * sender
+            return (ge | self.lane_high_bits[sender]) == self.all_high_bits and \
+                (self.clock_u64 >> shift) & 0xFF == ((packed >> shift) & 0xFF) - 1
+
+        if self.compiled_check is not None:
+            return self.compiled_check(self.vector_clock, timestamp, sender, self.num_processes)
+
+        # Single vectorized compare; the mask skips the sender's entry, which is checked below
+        ge = np.greater_equal(self.vector_clock, timestamp, out=self.ge_scratch[sender], where=self.not_sender_masks[sender])
+        return bool(ge.all()) and self.vector_clock[sender] == timestamp[sender] - 1
+
     def receive_message(self, message):
         """Receive a message and check if it can be delivered immediately."""
-        sender = message["sender"]
-        timestamp = message["timestamp"]
+        sender = message.sender
+        timestamp = message.timestamp
 
         self.gui.update_log(f"Process {self.id} RECEIVED message from Process {sender} with timestamp {timestamp}")
 
         # Causal Ordering Check
-        if all(self.vector_clock[i] >= timestamp[i] for i in range(self.num_processes) if i != sender) and \
-                self.vector_clock[sender] == timestamp[sender] - 1:
+        if self.can_deliver(sender, timestamp, message.packed):
             self.deliver_message(message)
+            self.check_buffer()  # Deliver buffered messages whose dependencies are now met
         else:
-            self.buffer.append(message)
+            self.buffer_message(message)
             self.gui.update_log(f"Process {self.id} BUFFERED message from Process {sender} due to missing dependencies.")
 
     def deliver_message(self, message):
         """Deliver a message and update vector clock."""
-        sender = message["sender"]
-        timestamp = message["timestamp"]
+        sender = message.sender
+        timestamp = message.timestamp
 
         # Merge vector clocks
-        self.vector_clock = np.maximum(self.vector_clock, timestamp)
+        np.maximum(self.vector_clock, timestamp, out=self.vector_clock)
+        if self.use_swar:
+            if self.vector_clock.max() > SWAR_LANE_LIMIT:
+                self.use_swar = False
+            else:
+                self.clock_u64 = pack_clock(self.vector_clock)
         self.gui.update_log(f"Process {self.id} DELIVERED message from Process {sender}. Updated vector clock: {self.vector_clock}")
 
-        # Check and deliver buffered messages if dependencies are now met
-        self.check_buffer()
+    def buffer_message(self, message):
+        """Queue a message in its sender's bucket, kept in order of the sender's clock entry."""
+        sender = message.sender
+        bucket = self.buffer[sender]
+        position = len(bucket)
+        while position > 0 and bucket[position - 1].timestamp[sender] > message.timestamp[sender]:
+            position -= 1
+        bucket.insert(position, message)
+        self.buffered += 1
 
     def check_buffer(self):
-        """Check buffered messages and process them if dependencies are satisfied."""
-        for message in self.buffer[:]:  # Iterate over a copy of the buffer
-            sender = message["sender"]
-            timestamp = message["timestamp"]
-
-            if all(self.vector_clock[i] >= timestamp[i] for i in range(self.num_processes) if i != sender) and \
-                    self.vector_clock[sender] == timestamp[sender] - 1:
-                self.deliver_message(message)
-                self.buffer.remove(message)  # Remove from buffer after delivery
+        """
+        Check buffered messages and process them if dependencies are satisfied.
+        Only the head of each sender's bucket can be that sender's next message,
+        so each pass peeks at the heads, and passes repeat until one delivers nothing.
+        """
+        if not self.buffered:
+            return
+
+        can_deliver = self.can_deliver  # Bound once, reused for every buffered message
+        deliver = self.deliver_message
+
+        delivered_now = True
+        while delivered_now:
+            delivered_now = False
+            for sender, bucket in enumerate(self.buffer):
+                while bucket and can_deliver(sender, bucket[0].timestamp, bucket[0].packed):
+                    deliver(bucket.popleft())
+                    self.buffered -= 1
+                    delivered_now = True  # Clock advanced, so check again
 
 class BSSGUI:
     def __init__(self, root):
@@ -80,6 +197,14 @@ class BSSGUI:
         # Log display
         self.log_text = tk.Text(root, height=15, width=80)
         self.log_text.pack()
+        self.log_buffer = []  # Log lines waiting for the next idle flush
+        self.log_flush_pending = False
+
+        # Algorithm work runs on one worker thread; GUI updates come back through gui_queue
+        self.work_queue = queue.SimpleQueue()
+        self.gui_queue = queue.SimpleQueue()
+        self.gui_handlers = {"log": self.append_log, "animate": self.draw_message, "after": self.schedule_work}
+        threading.Thread(target=self.run_worker, daemon=True).start()
 
         self.processes = []
         self.num_processes = 3
@@ -92,9 +217,9 @@ class BSSGUI:
         btn_frame = tk.Frame(root)
         btn_frame.pack()
 
-        tk.Button(btn_frame, text="P1 → P2 (M1)", command=lambda: self.processes[0].send_message(1, self.processes)).pack(side=tk.LEFT)
-        tk.Button(btn_frame, text="P2 → P3 (M2)", command=lambda: self.processes[1].send_message(2, self.processes)).pack(side=tk.LEFT)
-        tk.Button(btn_frame, text="Out-of-Order P2 → P3 (M3)", command=lambda: self.processes[1].send_message(2, self.processes)).pack(side=tk.LEFT)
+        tk.Button(btn_frame, text="P1 → P2 (M1)", command=lambda: self.submit(self.processes[0].send_message, 1, self.processes)).pack(side=tk.LEFT)
+        tk.Button(btn_frame, text="P2 → P3 (M2)", command=lambda: self.submit(self.processes[1].send_message, 2, self.processes)).pack(side=tk.LEFT)
+        tk.Button(btn_frame, text="Out-of-Order P2 → P3 (M3)", command=lambda: self.submit(self.processes[1].send_message, 2, self.processes)).pack(side=tk.LEFT)
 
         # Create Matplotlib Figure for Animation
         self.fig = Figure(figsize=(5, 3), dpi=100)
@@ -105,9 +230,45 @@ class BSSGUI:
 
         # Setup Process Lines
         self.process_lines = {0: "P1", 1: "P2", 2: "P3"}
-        self.message_lines = []
+        self.message_lines = []  # Message paths currently shown
+        self.free_lines = []  # Hidden message paths ready for reuse
+        self.background = None  # Axes without message paths, restored before each blit
 
+        self.canvas.mpl_connect("draw_event", self.on_draw)
         self.init_graph()
+        self.root.after(GUI_POLL_MS, self.poll_gui_queue)
+
+    def submit(self, func, *args):
+        """Queue algorithm work for the worker thread."""
+        self.work_queue.put((func, args))
+
+    def run_worker(self):
+        """Run queued algorithm work one task at a time, off the Tk thread."""
+        while True:
+            func, args = self.work_queue.get()
+            try:
+                func(*args)
+            except Exception as exc:  # Keep the worker alive, reporting like a Tk callback error
+                traceback.print_exc()
+                self.update_log(f"ERROR in {func.__name__}: {exc!r}")
+
+    def schedule(self, delay_ms, func, *args):
+        """Run func on the worker thread after delay_ms; safe to call from the worker."""
+        self.gui_queue.put(("after", delay_ms, func, *args))
+
+    def schedule_work(self, delay_ms, func, *args):
+        """Start the delay on the Tk timer, then hand func back to the worker."""
+        self.root.after(delay_ms, self.submit, func, *args)
+
+    def poll_gui_queue(self):
+        """Apply the GUI events posted by the worker thread, then poll again."""
+        while True:
+            try:
+                event = self.gui_queue.get_nowait()
+            except queue.Empty:
+                break
+            self.gui_handlers[event[0]](*event[1:])
+        self.root.after(GUI_POLL_MS, self.poll_gui_queue)
 
     def init_graph(self):
         """Initialize the graphical representation."""
@@ -121,27 +282,73 @@ class BSSGUI:
         for i in range(3):
             self.ax.plot([0, 10], [i, i], "k--")  # Dashed lines for processes
 
+        # Message paths are animated artists, drawn by blitting rather than full redraws
+        self.message_lines = []
+        self.free_lines = [self.new_message_line() for _ in range(LINE_POOL_SIZE)]
+
         self.canvas.draw()
 
+    def new_message_line(self):
+        """Create a hidden message path artist."""
+        line, = self.ax.plot([], [], "bo-", animated=True, visible=False)
+        return line
+
+    def on_draw(self, event):
+        """Cache the static background after a full redraw and put the message paths back on top."""
+        self.background = self.canvas.copy_from_bbox(self.ax.bbox)
+        for line in self.message_lines:
+            self.ax.draw_artist(line)
+
+    def blit_message_lines(self):
+        """Redraw only the message paths over the cached background."""
+        self.canvas.restore_region(self.background)
+        for line in self.message_lines:
+            self.ax.draw_artist(line)
+        self.canvas.blit(self.ax.bbox)
+
     def animate_message(self, sender, receiver):
+        """Post a message animation to the Tk thread."""
+        self.gui_queue.put(("animate", sender, receiver))
+
+    def draw_message(self, sender, receiver):
         """Animate message movement."""
         x_data = [1, 2]
         y_data = [sender, receiver]
 
-        line, = self.ax.plot(x_data, y_data, "bo-")  # Message path
+        line = self.free_lines.pop() if self.free_lines else self.new_message_line()  # Message path
+        line.set_data(x_data, y_data)
+        line.set_visible(True)
         self.message_lines.append(line)
 
-        self.canvas.draw()
-        time.sleep(1)  # Pause before removing animation
+        self.blit_message_lines()
 
         # Remove animation after delay
-        line.remove()
-        self.canvas.draw()
+        self.root.after(1000, self.remove_message_line, line)
+
+    def remove_message_line(self, line):
+        """Hide a finished message path and return it to the pool."""
+        line.set_visible(False)
+        self.message_lines.remove(line)
+        self.free_lines.append(line)
+        self.blit_message_lines()
 
     def update_log(self, message):
-        """Update the log output on the GUI."""
-        self.log_text.insert(tk.END, message + "\n")
+        """Post a line for the log output to the Tk thread."""
+        self.gui_queue.put(("log", message))
+
+    def append_log(self, message):
+        """Queue a line for the log output; lines are written together once the GUI is idle."""
+        self.log_buffer.append(message)
+        if not self.log_flush_pending:
+            self.log_flush_pending = True
+            self.root.after_idle(self.flush_log)
+
+    def flush_log(self):
+        """Write all queued log lines with a single insert and scroll."""
+        self.log_text.insert(tk.END, "\n".join(self.log_buffer) + "\n")
         self.log_text.see(tk.END)
+        self.log_buffer.clear()
+        self.log_flush_pending = False
 
 # Run GUI
 if __name__ == "__main__":
@@ -1,17 +1,32 @@
+import collections
+import queue
+import threading
+import traceback
 import numpy as np
-import time
 import tkinter as tk
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import matplotlib.animation as animation
 
+GUI_POLL_MS = 16  # How often the Tk thread drains events posted by the worker
+
+class Message:
+    __slots__ = ("sender", "receiver", "timestamp", "label")  # Fixed fields, no per-message dict
+
+    def __init__(self, sender, receiver, timestamp, label):
+        self.sender = sender
+        self.receiver = receiver
+        self.timestamp = timestamp  # Read-only copy of sender's vector clock
+        self.label = label
+
 class ProcessSES:
     def __init__(self, id, num_processes, gui):
         """Initialize process with vector clock and buffer."""
         self.id = id
         self.num_processes = num_processes
         self.vector_clock = np.zeros(num_processes, dtype=int)  # Vector clock for this process
-        self.buffer = []  # Buffer for out-of-order messages
+        self.buffer = [collections.deque() for _ in range(num_processes)]  # Out-of-order messages, one bucket per sender
+        self.buffered = 0  # Total number of messages across all buckets
         self.gui = gui  # Reference to GUI for updates
 
     def increment_clock(self):
@@ -21,56 +36,78 @@ class ProcessSES:
     def send_message(self, receiver, processes, message_label):
         """Send a message with a timestamp."""
         self.increment_clock()
-        timestamp = self.vector_clock.copy()
+        # Immutable snapshot: one memcpy into bytes, viewed read-only by receivers
+        timestamp = np.frombuffer(self.vector_clock.tobytes(), dtype=self.vector_clock.dtype)
 
-        message = {"sender": self.id, "receiver": receiver, "timestamp": timestamp, "label": message_label}
+        message = Message(self.id, receiver, timestamp, message_label)
         self.gui.update_log(f"Process {self.id} SENT message {message_label} to Process {receiver} with timestamp {timestamp}")
 
-        # Simulating network delay
-        time.sleep(1)
+        # Simulating network delay without blocking the GUI event loop
+        self.gui.schedule(1000, self.transmit_message, receiver, processes, message)
 
-        # Deliver message to the receiver process
+    def transmit_message(self, receiver, processes, message):
+        """Hand a sent message to the receiver once the network delay has elapsed."""
         processes[receiver].receive_message(message)
-        self.gui.animate_message(self.id, receiver, message_label, timestamp)  # Animate message flow
+        self.gui.animate_message(self.id, receiver, message.label, message.timestamp)  # Animate message flow
 
     def receive_message(self, message):
         """Receive a message and check if it can be delivered immediately."""
-        sender = message["sender"]
-        timestamp = message["timestamp"]
-        message_label = message["label"]
+        sender = message.sender
+        timestamp = message.timestamp
+        message_label = message.label
 
         self.gui.update_log(f"Process {self.id} RECEIVED message {message_label} from Process {sender} with timestamp {timestamp}")
 
         # SES only checks the dependency on the sender
         if self.vector_clock[sender] == timestamp[sender] - 1:
-            self.deliver_message(message)
+            advanced = self.deliver_message(message)
+            self.check_buffer(advanced)  # Deliver buffered messages whose dependencies are now met
         else:
-            self.buffer.append(message)
+            self.buffer_message(message)
             self.gui.update_log(f"Process {self.id} BUFFERED message {message_label} from Process {sender} due to missing dependencies.")
 
     def deliver_message(self, message):
-        """Deliver a message and update vector clock."""
-        sender = message["sender"]
-        timestamp = message["timestamp"]
-        message_label = message["label"]
+        """Deliver a message and update vector clock. Returns the clock entries that advanced."""
+        sender = message.sender
+        timestamp = message.timestamp
+        message_label = message.label
 
         # Merge vector clocks
-        self.vector_clock = np.maximum(self.vector_clock, timestamp)
+        advanced = np.flatnonzero(timestamp > self.vector_clock)
+        np.maximum(self.vector_clock, timestamp, out=self.vector_clock)
         self.gui.update_log(f"Process {self.id} DELIVERED message {message_label} from Process {sender}. Updated clock: {self.vector_clock}")
-
-        # Check and deliver buffered messages if dependencies are now met
-        self.check_buffer()
-
-    def check_buffer(self):
-        """Check buffered messages and process them if dependencies are satisfied."""
-        for message in self.buffer[:]:  # Iterate over a copy of the buffer
-            sender = message["sender"]
-            timestamp = message["timestamp"]
-            message_label = message["label"]
-
-            if self.vector_clock[sender] == timestamp[sender] - 1:
-                self.deliver_message(message)
-                self.buffer.remove(message)  # Remove from buffer after delivery
+        return advanced
+
+    def buffer_message(self, message):
+        """Queue a message in its sender's bucket, kept in order of the sender's clock entry."""
+        sender = message.sender
+        bucket = self.buffer[sender]
+        position = len(bucket)
+        while position > 0 and bucket[position - 1].timestamp[sender] > message.timestamp[sender]:
+            position -= 1
+        bucket.insert(position, message)
+        self.buffered += 1
+
+    def check_buffer(self, advanced):
+        """
+        Check buffered messages and process them if dependencies are satisfied.
+        A buffered message only waits on its sender's clock entry, so only the
+        buckets of senders whose entry advanced are checked, starting from the
+        given entries and adding whatever each further delivery advances.
+        """
+        if not self.buffered:
+            return
+
+        vc = self.vector_clock  # Merged in place, so this reference stays current
+        deliver = self.deliver_message
+
+        dirty = set(advanced.tolist())
+        while dirty:
+            sender = dirty.pop()
+            bucket = self.buffer[sender]
+            while bucket and vc[sender] == bucket[0].timestamp[sender] - 1:
+                dirty.update(deliver(bucket.popleft()).tolist())
+                self.buffered -= 1
 
 class SESGUI:
     def __init__(self, root):
@@ -81,6 +118,14 @@ class SESGUI:
         # Log display
         self.log_text = tk.Text(root, height=12, width=80, bg="black", fg="white")
         self.log_text.pack()
+        self.log_buffer = []  # Log lines waiting for the next idle flush
+        self.log_flush_pending = False
+
+        # Algorithm work runs on one worker thread; GUI updates come back through gui_queue
+        self.work_queue = queue.SimpleQueue()
+        self.gui_queue = queue.SimpleQueue()
+        self.gui_handlers = {"log": self.append_log, "animate": self.draw_message, "after": self.schedule_work}
+        threading.Thread(target=self.run_worker, daemon=True).start()
 
         self.processes = []
         self.num_processes = 3
@@ -93,9 +138,9 @@ class SESGUI:
         btn_frame = tk.Frame(root)
         btn_frame.pack()
 
-        tk.Button(btn_frame, text="P1 → P3 (m0)", command=lambda: self.processes[0].send_message(2, self.processes, "m0")).pack(side=tk.LEFT)
-        tk.Button(btn_frame, text="P1 → P2 (m1)", command=lambda: self.processes[0].send_message(1, self.processes, "m1")).pack(side=tk.LEFT)
-        tk.Button(btn_frame, text="Out-of-Order P2 → P3 (m2)", command=lambda: self.processes[1].send_message(2, self.processes, "m2")).pack(side=tk.LEFT)
+        tk.Button(btn_frame, text="P1 → P3 (m0)", command=lambda: self.submit(self.processes[0].send_message, 2, self.processes, "m0")).pack(side=tk.LEFT)
+        tk.Button(btn_frame, text="P1 → P2 (m1)", command=lambda: self.submit(self.processes[0].send_message, 1, self.processes, "m1")).pack(side=tk.LEFT)
+        tk.Button(btn_frame, text="Out-of-Order P2 → P3 (m2)", command=lambda: self.submit(self.processes[1].send_message, 2, self.processes, "m2")).pack(side=tk.LEFT)
 
         # Create Matplotlib Figure for Animation
         self.fig = Figure(figsize=(6, 4), dpi=100)
@@ -107,8 +152,44 @@ class SESGUI:
         # Setup Process Lines
         self.process_lines = {0: "P1", 1: "P2", 2: "P3"}
         self.message_points = []
+        self.message_labels = []
+        self.background = None  # Figure without messages, restored before each blit
 
+        self.canvas.mpl_connect("draw_event", self.on_draw)
         self.init_graph()
+        self.root.after(GUI_POLL_MS, self.poll_gui_queue)
+
+    def submit(self, func, *args):
+        """Queue algorithm work for the worker thread."""
+        self.work_queue.put((func, args))
+
+    def run_worker(self):
+        """Run queued algorithm work one task at a time, off the Tk thread."""
+        while True:
+            func, args = self.work_queue.get()
+            try:
+                func(*args)
+            except Exception as exc:  # Keep the worker alive, reporting like a Tk callback error
+                traceback.print_exc()
+                self.update_log(f"ERROR in {func.__name__}: {exc!r}")
+
+    def schedule(self, delay_ms, func, *args):
+        """Run func on the worker thread after delay_ms; safe to call from the worker."""
+        self.gui_queue.put(("after", delay_ms, func, *args))
+
+    def schedule_work(self, delay_ms, func, *args):
+        """Start the delay on the Tk timer, then hand func back to the worker."""
+        self.root.after(delay_ms, self.submit, func, *args)
+
+    def poll_gui_queue(self):
+        """Apply the GUI events posted by the worker thread, then poll again."""
+        while True:
+            try:
+                event = self.gui_queue.get_nowait()
+            except queue.Empty:
+                break
+            self.gui_handlers[event[0]](*event[1:])
+        self.root.after(GUI_POLL_MS, self.poll_gui_queue)
 
     def init_graph(self):
         """Initialize the graphical representation."""
@@ -123,28 +204,65 @@ class SESGUI:
         for i in range(3):
             self.ax.plot([0, 10], [i, i], "k--")  # Dashed lines for processes
 
+        # Messages are animated artists, drawn by blitting rather than full redraws
+        self.message_points = []
+        self.message_labels = []
+
         self.canvas.draw()
 
+    def on_draw(self, event):
+        """Cache the static background after a full redraw and put the messages back on top."""
+        # Whole figure, not just the axes: sender labels extend past the left axes edge
+        self.background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self.draw_messages()
+
+    def draw_messages(self):
+        """Draw every message path and label onto the canvas."""
+        for artist in self.message_points + self.message_labels:
+            self.ax.draw_artist(artist)
+
+    def blit_messages(self):
+        """Redraw only the messages over the cached background."""
+        self.canvas.restore_region(self.background)
+        self.draw_messages()
+        self.canvas.blit(self.fig.bbox)
+
     def animate_message(self, sender, receiver, message_label, timestamp):
+        """Post a message animation to the Tk thread."""
+        self.gui_queue.put(("animate", sender, receiver, message_label, timestamp))
+
+    def draw_message(self, sender, receiver, message_label, timestamp):
         """Animate message movement and show labels on process lines."""
         x_data = [1, 2]
         y_data = [sender, receiver]
 
         # Plot message movement
-        line, = self.ax.plot(x_data, y_data, "ro-", markersize=8, linewidth=2)  # Message path (red)
+        line, = self.ax.plot(x_data, y_data, "ro-", markersize=8, linewidth=2, animated=True)  # Message path (red)
         self.message_points.append(line)
 
         # Label messages at endpoints
-        self.ax.text(1, sender, f"{message_label}({timestamp})", fontsize=10, color="blue", verticalalignment='bottom', horizontalalignment='right')
-        self.ax.text(2, receiver, f"{message_label}", fontsize=10, color="green", verticalalignment='bottom', horizontalalignment='left')
+        self.message_labels.append(self.ax.text(1, sender, f"{message_label}({timestamp})", fontsize=10, color="blue", verticalalignment='bottom', horizontalalignment='right', animated=True))
+        self.message_labels.append(self.ax.text(2, receiver, f"{message_label}", fontsize=10, color="green", verticalalignment='bottom', horizontalalignment='left', animated=True))
 
-        self.canvas.draw()
-        time.sleep(1)  # Pause before removing animation
+        self.blit_messages()
 
     def update_log(self, message):
-        """Update the log output on the GUI."""
-        self.log_text.insert(tk.END, message + "\n")
+        """Post a line for the log output to the Tk thread."""
+        self.gui_queue.put(("log", message))
+
+    def append_log(self, message):
+        """Queue a line for the log output; lines are written together once the GUI is idle."""
+        self.log_buffer.append(message)
+        if not self.log_flush_pending:
+            self.log_flush_pending = True
+            self.root.after_idle(self.flush_log)
+
+    def flush_log(self):
+        """Write all queued log lines with a single insert and scroll."""
+        self.log_text.insert(tk.END, "\n".join(self.log_buffer) + "\n")
         self.log_text.see(tk.END)
+        self.log_buffer.clear()
+        self.log_flush_pending = False
 
 # Run GUI
 if __name__ == "__main__":